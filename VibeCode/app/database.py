@@ -1,12 +1,32 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+import os
+from typing import Any, Dict, List
 
-DATABASE_URL = "sqlite:///./skillswap.db"
+from sqlalchemy import event, insert
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy.orm import declarative_base
 
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False},
-)
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite+aiosqlite:///./skillswap.db")
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+engine = create_async_engine(DATABASE_URL)
+
+if engine.dialect.name == "sqlite":
+    @event.listens_for(engine.sync_engine, "connect")
+    def _set_sqlite_pragma(dbapi_connection, _connection_record):
+        # WAL lets readers proceed during writes; NORMAL only syncs at checkpoints, which is safe under WAL.
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA mmap_size=268435456")
+        cursor.close()
+
+# expire_on_commit=False: attributes must stay readable after commit, since lazy
+# loads are not possible from templates under an async session.
+SessionLocal = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
 Base = declarative_base()
+
+
+async def bulk_insert(db: AsyncSession, model, rows: List[Dict[str, Any]]) -> None:
+    """Insert many rows of `model` in one executemany round-trip; the caller commits."""
+    if rows:
+        await db.execute(insert(model), rows)
@@ -1,69 +1,174 @@
-from typing import Optional, List, Dict
-from statistics import mean
-from fastapi import FastAPI, Request, Depends, Form, HTTPException
-from fastapi.responses import HTMLResponse, RedirectResponse
+import asyncio
+import hashlib
+import os
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional, List, Dict, Sequence
+from fastapi import FastAPI, Request, Depends, Form, HTTPException, Query
+from fastapi.responses import HTMLResponse, ORJSONResponse, RedirectResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from starlette.middleware.sessions import SessionMiddleware
 from starlette.templating import Jinja2Templates
-from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from jinja2 import FileSystemBytecodeCache
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased, selectinload
+from sqlalchemy import or_, and_, case, func, select, delete, tuple_, union_all
 from passlib.context import CryptContext
+from cachetools import TTLCache
 
-from .database import SessionLocal, Base, engine
-from .models import User, Message, ExchangeSession, Rating
-
-# Initialize DB
-Base.metadata.create_all(bind=engine)
+from .database import SessionLocal, engine, bulk_insert
+from .models import User, UserSkill, Message, ExchangeSession, Rating, users_fts, SEARCH_COLUMNS
 
 app = FastAPI(title="SkillSwap")
 app.add_middleware(SessionMiddleware, secret_key="dev-secret-change-me")
 
 app.mount("/static", StaticFiles(directory="app/static"), name="static")
 templates = Jinja2Templates(directory="app/templates")
+if os.getenv("ENV", "production") != "dev":
+    # Outside dev, skip per-render mtime checks and reuse compiled templates across restarts.
+    templates.env.auto_reload = False
+    templates.env.bytecode_cache = FileSystemBytecodeCache()
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Lower BCRYPT_ROUNDS (e.g. 4) in dev/tests; each extra round doubles hashing cost.
+pwd_context = CryptContext(schemes=["bcrypt"], bcrypt__rounds=int(os.getenv("BCRYPT_ROUNDS", "12")), deprecated="auto")
 
+MATCH_LIMIT = 20
+MAX_MATCH_LIMIT = 100
+RECENT_RATINGS_LIMIT = 20
+PAGE_SIZE = 20
+# Cursor ids are bound as SQL integers; larger values overflow the driver instead of matching nothing.
+MAX_CURSOR_ID = 2**63 - 1
+USER_SEARCH_LIMIT = 20
+CATALOG_CACHE_TTL = 30
 
-def get_db():
-    db = SessionLocal()
-    try:
+# Catalog pages keyed on (q, cursor, latest users.updated_at), so an entry is never served after a profile change.
+_catalog_cache: TTLCache = TTLCache(maxsize=1024, ttl=CATALOG_CACHE_TTL)
+
+
+@dataclass(frozen=True)
+class CurrentUser:
+    """What most pages need about the logged-in user; handlers that need more load the User row."""
+    id: int
+    name: str
+
+
+# Keyed on user id. Entries are dropped on profile update and logout in this process;
+# other workers may show a stale name for up to the TTL.
+_current_user_cache: TTLCache = TTLCache(maxsize=4096, ttl=60)
+
+
+async def get_db():
+    async with SessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 
-def get_current_user(request: Request, db: Session) -> Optional[User]:
+async def get_current_user(request: Request, db: AsyncSession) -> Optional[CurrentUser]:
     user_id = request.session.get("user_id")
     if not user_id:
         return None
-    return db.query(User).filter(User.id == user_id).first()
+    current = _current_user_cache.get(user_id)
+    if current is None:
+        row = (await db.execute(select(User.id, User.name).where(User.id == user_id))).first()
+        if row is None:
+            return None
+        current = _current_user_cache[user_id] = CurrentUser(id=row.id, name=row.name)
+    return current
 
 
-def require_login(request: Request, db: Session) -> User:
-    user = get_current_user(request, db)
+async def require_login(request: Request, db: AsyncSession) -> CurrentUser:
+    user = await get_current_user(request, db)
     if not user:
         raise HTTPException(status_code=302, detail="Redirect", headers={"Location": "/login"})
     return user
 
 
+async def require_user_row(request: Request, db: AsyncSession) -> User:
+    """Load the full User for the logged-in user, redirecting to /login if the row is gone.
+
+    The id comes from the session (via a cache), so it can outlive the row, e.g. after a DB reset.
+    """
+    current = await require_login(request, db)
+    user = await db.get(User, current.id)
+    if user is None:
+        _current_user_cache.pop(current.id, None)
+        request.session.clear()
+        raise HTTPException(status_code=302, detail="Redirect", headers={"Location": "/login"})
+    return user
+
+
+def stream_template(name: str, context: Dict, headers: Optional[Dict[str, str]] = None) -> StreamingResponse:
+    # Render incrementally so the first bytes go out before the whole page is built.
+    # Everything the template reads must already be loaded: the DB session is closed by then.
+    return StreamingResponse(templates.get_template(name).generate(context), media_type="text/html", headers=headers)
+
+
+def next_page(request: Request, rows, cursor) -> Optional[str]:
+    # Pages fetch PAGE_SIZE + 1 rows; the extra row only signals that another page exists.
+    if len(rows) <= PAGE_SIZE:
+        return None
+    return str(request.url.include_query_params(cursor=cursor(rows[PAGE_SIZE - 1])))
+
+
+def parse_message_cursor(cursor: str):
+    # Inbox cursors are "<created_at ISO timestamp>,<message id>"; the id breaks timestamp ties.
+    created_at, _, message_id = cursor.rpartition(",")
+    try:
+        created_at, message_id = datetime.fromisoformat(created_at), int(message_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not 0 <= message_id <= MAX_CURSOR_ID:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return created_at, message_id
+
+
 def normalize_skills(skills_text: str) -> List[str]:
-    return [s.strip().lower() for s in (skills_text or "").split(",") if s.strip()]
+    return [s for t in (skills_text or "").lower().split(",") if (s := t.strip())]
+
+
+def canonical_skills(skills_text: str) -> str:
+    return ",".join(sorted({s[:64].rstrip() for s in normalize_skills(skills_text)}))
+
+
+def split_canonical(skills_norm: str) -> List[str]:
+    # Canonical values are already stripped, lowercased and de-duplicated.
+    return skills_norm.split(",") if skills_norm else []
+
+
+def set_user_skills(user: User, skills_offered: str, skills_wanted: str) -> None:
+    user.skills_offered = skills_offered
+    user.skills_wanted = skills_wanted
+    user.skills_offered_norm = canonical_skills(skills_offered)
+    user.skills_wanted_norm = canonical_skills(skills_wanted)
+
+
+async def sync_user_skills(db: AsyncSession, user: User) -> None:
+    """Replace the user's rows in user_skills with their canonical offered/wanted skills.
+
+    The caller owns the transaction; the user must already have an id (flush first).
+    """
+    await db.execute(delete(UserSkill).where(UserSkill.user_id == user.id))
+    rows = [
+        {"user_id": user.id, "skill": skill, "kind": kind}
+        for kind, skills_norm in (("offered", user.skills_offered_norm), ("wanted", user.skills_wanted_norm))
+        for skill in split_canonical(skills_norm)
+    ]
+    await bulk_insert(db, UserSkill, rows)
 
 
 @app.get("/", response_class=HTMLResponse)
-def home(request: Request, db: Session = Depends(get_db)):
-    user = get_current_user(request, db)
+async def home(request: Request, db: AsyncSession = Depends(get_db)):
+    user = await get_current_user(request, db)
     return templates.TemplateResponse("index.html", {"request": request, "user": user})
 
 
 # Auth
 @app.get("/register", response_class=HTMLResponse)
-def register_form(request: Request):
+async def register_form(request: Request):
     return templates.TemplateResponse("auth/register.html", {"request": request, "error": None})
 
 
 @app.post("/register")
-def register(
+async def register(
     request: Request,
     name: str = Form(...),
     email: str = Form(...),
@@ -72,9 +177,9 @@ def register(
     bio: str = Form(""),
     skills_offered: str = Form(""),
     skills_wanted: str = Form(""),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
-    existing = db.query(User).filter(User.email == email).first()
+    existing = (await db.scalars(select(User).where(User.email == email))).first()
     if existing:
         return templates.TemplateResponse(
             "auth/register.html",
@@ -84,28 +189,30 @@ def register(
     user = User(
         name=name,
         email=email.lower(),
-        password_hash=pwd_context.hash(password),
+        password_hash=await asyncio.to_thread(pwd_context.hash, password),
         location=location,
         bio=bio,
-        skills_offered=skills_offered,
-        skills_wanted=skills_wanted,
     )
+    set_user_skills(user, skills_offered, skills_wanted)
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.flush()
+    await sync_user_skills(db, user)
+    await db.commit()
+    # user.id was assigned by the flush above; no refresh needed.
     request.session["user_id"] = user.id
     return RedirectResponse("/", status_code=302)
 
 
 @app.get("/login", response_class=HTMLResponse)
-def login_form(request: Request):
+async def login_form(request: Request):
     return templates.TemplateResponse("auth/login.html", {"request": request, "error": None})
 
 
 @app.post("/login")
-def login(request: Request, email: str = Form(...), password: str = Form(...), db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.email == email.lower()).first()
-    if not user or not pwd_context.verify(password, user.password_hash):
+async def login(request: Request, email: str = Form(...), password: str = Form(...), db: AsyncSession = Depends(get_db)):
+    user = (await db.scalars(select(User).where(User.email == email.lower()))).first()
+    # bcrypt is deliberately slow; verify off the event loop so other requests keep being served.
+    if not user or not await asyncio.to_thread(pwd_context.verify, password, user.password_hash):
         return templates.TemplateResponse(
             "auth/login.html",
             {"request": request, "error": "Invalid credentials."},
@@ -116,133 +223,212 @@ def login(request: Request, email: str = Form(...), password: str = Form(...), d
 
 
 @app.get("/logout")
-def logout(request: Request):
+async def logout(request: Request):
+    _current_user_cache.pop(request.session.get("user_id"), None)
     request.session.clear()
     return RedirectResponse("/", status_code=302)
 
 
 # Profile
 @app.get("/profile", response_class=HTMLResponse)
-def profile_form(request: Request, db: Session = Depends(get_db)):
-    user = require_login(request, db)
+async def profile_form(request: Request, db: AsyncSession = Depends(get_db)):
+    user = await require_user_row(request, db)
     return templates.TemplateResponse("users/profile.html", {"request": request, "user": user, "message": None})
 
 
 @app.post("/profile")
-def profile_update(
+async def profile_update(
     request: Request,
     name: str = Form(...),
     location: str = Form(""),
     bio: str = Form(""),
     skills_offered: str = Form(""),
     skills_wanted: str = Form(""),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
-    user = require_login(request, db)
+    user = await require_user_row(request, db)
     user.name = name
     user.location = location
     user.bio = bio
-    user.skills_offered = skills_offered
-    user.skills_wanted = skills_wanted
-    db.commit()
-    db.refresh(user)
+    set_user_skills(user, skills_offered, skills_wanted)
+    await sync_user_skills(db, user)
+    await db.commit()
+    _current_user_cache.pop(user.id, None)
     return templates.TemplateResponse("users/profile.html", {"request": request, "user": user, "message": "Profile updated."})
 
 
+# Declared before /users/{user_id} so "search" is not parsed as an id.
+@app.get("/users/search", response_class=ORJSONResponse)
+async def user_search(request: Request, q: str = "", db: AsyncSession = Depends(get_db)):
+    """Autocomplete source for the user pickers: up to USER_SEARCH_LIMIT other users whose name contains q."""
+    user = await require_login(request, db)
+    stmt = select(User.id, User.name).where(User.id != user.id).order_by(User.name).limit(USER_SEARCH_LIMIT)
+    if q.strip():
+        stmt = stmt.where(search_filter(q.strip(), ("name",)))
+    return [{"id": row.id, "name": row.name} for row in (await db.execute(stmt)).all()]
+
+
 @app.get("/users/{user_id}", response_class=HTMLResponse)
-def view_user(user_id: int, request: Request, db: Session = Depends(get_db)):
-    viewer = get_current_user(request, db)
-    user = db.query(User).filter(User.id == user_id).first()
+async def view_user(user_id: int, request: Request, db: AsyncSession = Depends(get_db)):
+    viewer = await get_current_user(request, db)
+    user = await db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    ratings = db.query(Rating).filter(Rating.ratee_id == user.id).all()
-    avg_rating: Optional[float] = mean([r.score for r in ratings]) if ratings else None
-    return templates.TemplateResponse("users/view.html", {"request": request, "viewer": viewer, "profile": user, "avg_rating": avg_rating, "ratings": ratings})
+    avg_rating, rating_count = (
+        await db.execute(select(func.avg(Rating.score), func.count(Rating.id)).where(Rating.ratee_id == user.id))
+    ).one()
+    ratings = (
+        await db.scalars(
+            select(Rating)
+            .where(Rating.ratee_id == user.id)
+            .order_by(Rating.created_at.desc())
+            .limit(RECENT_RATINGS_LIMIT)
+        )
+    ).all()
+    return templates.TemplateResponse(
+        "users/view.html",
+        {"request": request, "viewer": viewer, "profile": user, "avg_rating": avg_rating, "rating_count": rating_count, "ratings": ratings},
+    )
 
 
 # Catalog
-@app.get("/skills", response_class=HTMLResponse)
-def skill_catalog(request: Request, q: Optional[str] = None, db: Session = Depends(get_db)):
-    viewer = get_current_user(request, db)
-    query = db.query(User)
+def search_filter(q: str, columns: Sequence[str] = SEARCH_COLUMNS):
+    """WHERE clause matching users whose `columns` contain q (case-insensitive substring)."""
+    if engine.dialect.name == "sqlite" and len(q) >= 3 and "\x00" not in q:
+        # Trigram FTS needs at least three characters; quote q so it is matched as a literal substring.
+        # FTS5 query strings cannot contain NUL (MATCH fails with "unterminated string"), so those use ILIKE.
+        phrase = '"' + q.replace('"', '""') + '"'
+        if tuple(columns) != SEARCH_COLUMNS:
+            phrase = "{" + " ".join(columns) + "} : " + phrase
+        return User.id.in_(select(users_fts.c.rowid).where(users_fts.c.users_fts.match(phrase)))
+    like = f"%{q.lower()}%"
+    return or_(*(getattr(User, c).ilike(like) for c in columns))
+
+
+async def search_catalog(db: AsyncSession, q: str, cursor: Optional[int], last_modified) -> tuple:
+    key = (q, cursor, last_modified)
+    users = _catalog_cache.get(key)
+    if users is not None:
+        return users
+    stmt = select(User.id, User.name, User.location, User.skills_offered, User.skills_wanted).order_by(User.id)
+    if cursor is not None:
+        stmt = stmt.where(User.id > cursor)
     if q:
-        like = f"%{q.lower()}%"
-        query = query.filter(
-            or_(
-                User.name.ilike(like),
-                User.location.ilike(like),
-                User.skills_offered.ilike(like),
-                User.skills_wanted.ilike(like),
-            )
-        )
-    users = query.limit(100).all()
-    return templates.TemplateResponse("skills/browse.html", {"request": request, "user": viewer, "users": users, "q": q or ""})
+        stmt = stmt.where(search_filter(q))
+    users = _catalog_cache[key] = tuple((await db.execute(stmt.limit(PAGE_SIZE + 1))).all())
+    return users
+
+
+@app.get("/skills", response_class=HTMLResponse)
+async def skill_catalog(request: Request, q: Optional[str] = None, cursor: Optional[int] = Query(None, ge=0, le=MAX_CURSOR_ID), db: AsyncSession = Depends(get_db)):
+    viewer = await get_current_user(request, db)
+    q = q or ""
+    last_modified = await db.scalar(select(func.max(User.updated_at)))
+    # The page also renders the viewer's nav, so the ETag covers who is looking. no-cache makes
+    # the browser revalidate every hit, so a login/logout or profile edit is seen immediately.
+    tag = f"{viewer.id if viewer else ''}|{q}|{cursor}|{last_modified}"
+    etag = f'"{hashlib.sha1(tag.encode()).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    users = await search_catalog(db, q, cursor, last_modified)
+    next_url = next_page(request, users, lambda u: u.id)
+    if next_url:
+        headers["Link"] = f'<{next_url}>; rel="next"'
+    return stream_template(
+        "skills/browse.html",
+        {"request": request, "user": viewer, "users": users[:PAGE_SIZE], "q": q, "next_url": next_url},
+        headers=headers,
+    )
 
 
 # Matchmaking
 @app.get("/match", response_class=HTMLResponse)
-def match(request: Request, db: Session = Depends(get_db)):
-    user = require_login(request, db)
-    user_offered = set(normalize_skills(user.skills_offered))
-    user_wanted = set(normalize_skills(user.skills_wanted))
+async def match(request: Request, limit: int = Query(MATCH_LIMIT, ge=1, le=MAX_MATCH_LIMIT), db: AsyncSession = Depends(get_db)):
+    user = await require_user_row(request, db)
+    user_offered = split_canonical(user.skills_offered_norm)
+    user_wanted = split_canonical(user.skills_wanted_norm)
+
+    # Score candidates in SQL: each overlapping skill row is one point, and the overlapping
+    # skills themselves are aggregated per user so no Python-side intersection is needed.
+    offered_hit = and_(UserSkill.kind == "offered", UserSkill.skill.in_(user_wanted))
+    wanted_hit = and_(UserSkill.kind == "wanted", UserSkill.skill.in_(user_offered))
+    score = func.count().label("score")
+    top = (
+        await db.execute(
+            select(
+                UserSkill.user_id,
+                score,
+                func.aggregate_strings(case((UserSkill.kind == "offered", UserSkill.skill)), ",").label("offer_match"),
+                func.aggregate_strings(case((UserSkill.kind == "wanted", UserSkill.skill)), ",").label("want_match"),
+            )
+            .where(UserSkill.user_id != user.id, or_(offered_hit, wanted_hit))
+            .group_by(UserSkill.user_id)
+            .order_by(score.desc(), UserSkill.user_id)
+            .limit(limit)
+        )
+    ).all()
 
     matches: List[Dict] = []
-    candidates = db.query(User).filter(User.id != user.id).all()
-    for c in candidates:
-        c_offered = set(normalize_skills(c.skills_offered))
-        c_wanted = set(normalize_skills(c.skills_wanted))
-        offer_match = c_offered.intersection(user_wanted)
-        want_match = c_wanted.intersection(user_offered)
-        score = len(offer_match) + len(want_match)
-        if score > 0:
-            matches.append({
-                "user": c,
-                "offer_match": sorted(list(offer_match)),
-                "want_match": sorted(list(want_match)),
-                "score": score,
-            })
-    matches.sort(key=lambda m: m["score"], reverse=True)
+    ids = [row.user_id for row in top]
+    if ids:
+        users = {u.id: u for u in (await db.execute(select(User.id, User.name).where(User.id.in_(ids)))).all()}
+        matches = [
+            {
+                "user": users[row.user_id],
+                "offer_match": sorted(split_canonical(row.offer_match)),
+                "want_match": sorted(split_canonical(row.want_match)),
+                "score": row.score,
+            }
+            for row in top
+        ]
     return templates.TemplateResponse("match/matches.html", {"request": request, "user": user, "matches": matches})
 
 
 # Messaging
 @app.get("/messages", response_class=HTMLResponse)
-def inbox(request: Request, db: Session = Depends(get_db)):
-    user = require_login(request, db)
-    messages = (
-        db.query(Message)
-        .filter(or_(Message.sender_id == user.id, Message.receiver_id == user.id))
-        .order_by(Message.created_at.desc())
-        .limit(100)
-        .all()
+async def inbox(request: Request, cursor: Optional[str] = None, db: AsyncSession = Depends(get_db)):
+    user = await require_login(request, db)
+    # The template reads sender/receiver names, which cannot be lazy-loaded under an async session.
+    stmt = (
+        select(Message)
+        .options(selectinload(Message.sender), selectinload(Message.receiver))
+        .where(or_(Message.sender_id == user.id, Message.receiver_id == user.id))
+        .order_by(Message.created_at.desc(), Message.id.desc())
+        .limit(PAGE_SIZE + 1)
+    )
+    if cursor is not None:
+        stmt = stmt.where(tuple_(Message.created_at, Message.id) < parse_message_cursor(cursor))
+    messages = (await db.scalars(stmt)).all()
+    next_url = next_page(request, messages, lambda m: f"{m.created_at.isoformat()},{m.id}")
+    headers = {"Link": f'<{next_url}>; rel="next"'} if next_url else None
+    return stream_template(
+        "messages/inbox.html",
+        {"request": request, "user": user, "messages": messages[:PAGE_SIZE], "next_url": next_url},
+        headers=headers,
     )
-    return templates.TemplateResponse("messages/inbox.html", {"request": request, "user": user, "messages": messages})
 
 
 @app.get("/messages/{peer_id}", response_class=HTMLResponse)
-def thread(peer_id: int, request: Request, db: Session = Depends(get_db)):
-    user = require_login(request, db)
-    peer = db.query(User).filter(User.id == peer_id).first()
+async def thread(peer_id: int, request: Request, db: AsyncSession = Depends(get_db)):
+    user = await require_login(request, db)
+    peer = await db.get(User, peer_id)
     if not peer:
         raise HTTPException(status_code=404, detail="User not found")
-    messages = (
-        db.query(Message)
-        .filter(
-            or_(
-                (Message.sender_id == user.id) & (Message.receiver_id == peer.id),
-                (Message.sender_id == peer.id) & (Message.receiver_id == user.id),
-            )
-        )
-        .order_by(Message.created_at.asc())
-        .all()
-    )
+    # One range scan per direction on (sender_id, receiver_id, created_at); an OR of the two
+    # pairs can push the planner into a full scan.
+    sent = select(Message).where(Message.sender_id == user.id, Message.receiver_id == peer.id)
+    received = select(Message).where(Message.sender_id == peer.id, Message.receiver_id == user.id)
+    both = union_all(sent, received) if peer.id != user.id else sent
+    thread_message = aliased(Message, both.subquery())
+    messages = (await db.scalars(select(thread_message).order_by(thread_message.created_at.asc()))).all()
     return templates.TemplateResponse("messages/thread.html", {"request": request, "user": user, "peer": peer, "messages": messages, "error": None})
 
 
 @app.post("/messages/{peer_id}")
-def send_message(peer_id: int, request: Request, content: str = Form(...), db: Session = Depends(get_db)):
-    user = require_login(request, db)
-    peer = db.query(User).filter(User.id == peer_id).first()
+async def send_message(peer_id: int, request: Request, content: str = Form(...), db: AsyncSession = Depends(get_db)):
+    user = await require_login(request, db)
+    peer = await db.get(User, peer_id)
     if not peer:
         raise HTTPException(status_code=404, detail="User not found")
     if not content.strip():
@@ -253,61 +439,68 @@ def send_message(peer_id: int, request: Request, content: str = Form(...), db: S
         )
     msg = Message(sender_id=user.id, receiver_id=peer.id, content=content.strip())
     db.add(msg)
-    db.commit()
+    await db.commit()
     return RedirectResponse(f"/messages/{peer.id}", status_code=302)
 
 
 # Sessions
+async def get_picker_user(db: AsyncSession, user: CurrentUser, other_id: Optional[int]):
+    # Preselected entry for a user picker; the rest of the list comes from /users/search.
+    if not other_id:
+        return None
+    return (await db.execute(select(User.id, User.name).where(User.id == other_id, User.id != user.id))).first()
+
+
 @app.get("/sessions", response_class=HTMLResponse)
-def sessions_list(request: Request, db: Session = Depends(get_db)):
-    user = require_login(request, db)
+async def sessions_list(request: Request, db: AsyncSession = Depends(get_db)):
+    user = await require_login(request, db)
     sessions = (
-        db.query(ExchangeSession)
-        .filter(or_(ExchangeSession.user_a_id == user.id, ExchangeSession.user_b_id == user.id))
-        .order_by(ExchangeSession.occurred_at.desc())
-        .limit(100)
-        .all()
-    )
+        await db.scalars(
+            select(ExchangeSession)
+            .options(selectinload(ExchangeSession.user_a), selectinload(ExchangeSession.user_b))
+            .where(or_(ExchangeSession.user_a_id == user.id, ExchangeSession.user_b_id == user.id))
+            .order_by(ExchangeSession.occurred_at.desc())
+            .limit(100)
+        )
+    ).all()
     return templates.TemplateResponse("sessions/list.html", {"request": request, "user": user, "sessions": sessions})
 
 
 @app.get("/sessions/new", response_class=HTMLResponse)
-def new_session_form(request: Request, with_user: Optional[int] = None, skill: str = "", db: Session = Depends(get_db)):
-    user = require_login(request, db)
-    partner = db.query(User).filter(User.id == with_user).first() if with_user else None
-    users = db.query(User).filter(User.id != user.id).all()
-    return templates.TemplateResponse("sessions/new.html", {"request": request, "user": user, "partner": partner, "users": users, "skill": skill})
+async def new_session_form(request: Request, with_user: Optional[int] = None, skill: str = "", db: AsyncSession = Depends(get_db)):
+    user = await require_login(request, db)
+    partner = await get_picker_user(db, user, with_user)
+    return templates.TemplateResponse("sessions/new.html", {"request": request, "user": user, "partner": partner, "skill": skill})
 
 
 @app.post("/sessions/new")
-def create_session(request: Request, partner_id: int = Form(...), skill: str = Form(...), notes: str = Form(""), db: Session = Depends(get_db)):
-    user = require_login(request, db)
-    partner = db.query(User).filter(User.id == partner_id).first()
+async def create_session(request: Request, partner_id: int = Form(...), skill: str = Form(...), notes: str = Form(""), db: AsyncSession = Depends(get_db)):
+    user = await require_login(request, db)
+    partner = await db.get(User, partner_id)
     if not partner:
         raise HTTPException(status_code=404, detail="Partner not found")
     session = ExchangeSession(user_a_id=user.id, user_b_id=partner.id, skill=skill.strip() or "Skill Exchange", notes=notes)
     db.add(session)
-    db.commit()
+    await db.commit()
     return RedirectResponse("/sessions", status_code=302)
 
 
 # Ratings
 @app.get("/ratings/new", response_class=HTMLResponse)
-def rating_form(request: Request, for_user: Optional[int] = None, db: Session = Depends(get_db)):
-    user = require_login(request, db)
-    target = db.query(User).filter(User.id == for_user).first() if for_user else None
-    users = db.query(User).filter(User.id != user.id).all()
-    return templates.TemplateResponse("ratings/new.html", {"request": request, "user": user, "target": target, "users": users})
+async def rating_form(request: Request, for_user: Optional[int] = None, db: AsyncSession = Depends(get_db)):
+    user = await require_login(request, db)
+    target = await get_picker_user(db, user, for_user)
+    return templates.TemplateResponse("ratings/new.html", {"request": request, "user": user, "target": target})
 
 
 @app.post("/ratings/new")
-def create_rating(request: Request, ratee_id: int = Form(...), score: int = Form(...), comment: str = Form(""), db: Session = Depends(get_db)):
-    user = require_login(request, db)
-    ratee = db.query(User).filter(User.id == ratee_id).first()
+async def create_rating(request: Request, ratee_id: int = Form(...), score: int = Form(...), comment: str = Form(""), db: AsyncSession = Depends(get_db)):
+    user = await require_login(request, db)
+    ratee = await db.get(User, ratee_id)
     if not ratee:
         raise HTTPException(status_code=404, detail="User not found")
     s = max(1, min(5, int(score)))
     rating = Rating(rater_id=user.id, ratee_id=ratee.id, score=s, comment=comment)
     db.add(rating)
-    db.commit()
+    await db.commit()
     return RedirectResponse(f"/users/{ratee.id}", status_code=302)
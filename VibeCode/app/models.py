@@ -1,12 +1,21 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Enum, Index, table, column
+from sqlalchemy.orm import relationship, validates
 
 from .database import Base
 
 
+# Free-text columns searched by the skill catalog.
+SEARCH_COLUMNS = ("name", "location", "skills_offered", "skills_wanted")
+
+
 class User(Base):
     __tablename__ = "users"
+    # Postgres: trigram GIN indexes make the catalog's ILIKE '%q%' predicates index-backed.
+    __table_args__ = tuple(
+        Index(f"ix_users_{c}_trgm", c, postgresql_using="gin", postgresql_ops={c: "gin_trgm_ops"}).ddl_if(dialect="postgresql")
+        for c in SEARCH_COLUMNS
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(100), nullable=False)
@@ -17,13 +26,44 @@ class User(Base):
 
     skills_offered = Column(Text, default="")  # comma-separated
     skills_wanted = Column(Text, default="")   # comma-separated
+    # Canonical forms (normalized, de-duplicated, sorted, comma-joined), written on save.
+    skills_offered_norm = Column(Text, default="", nullable=False)
+    skills_wanted_norm = Column(Text, default="", nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False, index=True)
 
     sent_messages = relationship("Message", back_populates="sender", foreign_keys="Message.sender_id")
     received_messages = relationship("Message", back_populates="receiver", foreign_keys="Message.receiver_id")
 
+    @validates("skills_offered_norm", "skills_wanted_norm")
+    def _check_canonical(self, key, value):
+        skills = value.split(",") if value else []
+        if skills != sorted(set(skills)) or any(not s or s != s.strip().lower() for s in skills):
+            raise ValueError(f"{key} is not in canonical form: {value!r}")
+        return value
+
+
+# SQLite: an external-content FTS5 table with the trigram tokenizer supports substring
+# search. Migration 0002 creates it and the triggers that keep it in sync with users.
+users_fts = table("users_fts", column("rowid"), column("users_fts"))
+
+
+class UserSkill(Base):
+    __tablename__ = "user_skills"
+    __table_args__ = (Index("ix_skill_kind", "skill", "kind"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    skill = Column(String(64), nullable=False)  # normalized (stripped, lowercase)
+    kind = Column(Enum("offered", "wanted", name="skill_kind"), nullable=False)
+
 
 class Message(Base):
     __tablename__ = "messages"
+    __table_args__ = (
+        Index("ix_messages_sender_created", "sender_id", "created_at"),
+        Index("ix_messages_receiver_created", "receiver_id", "created_at"),
+        Index("ix_messages_sender_receiver_created", "sender_id", "receiver_id", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     sender_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -37,6 +77,10 @@ class Message(Base):
 
 class ExchangeSession(Base):
     __tablename__ = "sessions"
+    __table_args__ = (
+        Index("ix_sessions_a_occurred", "user_a_id", "occurred_at"),
+        Index("ix_sessions_b_occurred", "user_b_id", "occurred_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_a_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -45,9 +89,13 @@ class ExchangeSession(Base):
     occurred_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     notes = Column(Text, default="")
 
+    user_a = relationship("User", foreign_keys=[user_a_id])
+    user_b = relationship("User", foreign_keys=[user_b_id])
+
 
 class Rating(Base):
     __tablename__ = "ratings"
+    __table_args__ = (Index("ix_ratings_ratee_created", "ratee_id", "created_at"),)
 
     id = Column(Integer, primary_key=True, index=True)
     rater_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -0,0 +1,41 @@
+// Autocomplete for user pickers: <input data-user-picker="FIELD" list="..."> fills the hidden input FIELD with the chosen user id.
+// Options are labelled "name (#id)" so users who share a name stay distinguishable.
+const label = (u) => `${u.name} (#${u.id})`;
+
+document.querySelectorAll("input[data-user-picker]").forEach((input) => {
+	const hidden = input.form.elements[input.dataset.userPicker];
+	const list = document.getElementById(input.getAttribute("list"));
+	let ids = new Map();
+	let timer = null;
+	let latest = 0;
+
+	const search = async () => {
+		const query = input.value;
+		const request = ++latest;
+		const res = await fetch("/users/search?q=" + encodeURIComponent(query));
+		// Drop responses overtaken by a newer request or by further typing.
+		if (!res.ok || request !== latest || input.value !== query) return;
+		const users = await res.json();
+		if (request !== latest || input.value !== query) return;
+		ids = new Map(users.map((u) => [label(u), u.id]));
+		list.replaceChildren(...users.map((u) => new Option(label(u))));
+	};
+
+	input.addEventListener("input", () => {
+		input.setCustomValidity("");
+		clearTimeout(timer);
+		if (ids.has(input.value)) {
+			hidden.value = ids.get(input.value);
+			return;
+		}
+		if (input.value !== input.defaultValue) hidden.value = "";
+		timer = setTimeout(search, 250);
+	});
+	input.form.addEventListener("submit", (event) => {
+		if (!hidden.value) {
+			event.preventDefault();
+			input.setCustomValidity("Pick a user from the list.");
+			input.reportValidity();
+		}
+	});
+});
@@ -0,0 +1,72 @@
+"""Initial schema
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-15
+
+Matches the tables the app used to create with Base.metadata.create_all(). Databases created
+that way can be adopted with `alembic stamp 0001` followed by `alembic upgrade head`.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(length=100), nullable=False),
+        sa.Column("email", sa.String(length=255), nullable=False),
+        sa.Column("password_hash", sa.String(length=255), nullable=False),
+        sa.Column("location", sa.String(length=255), nullable=True),
+        sa.Column("bio", sa.Text(), nullable=True),
+        sa.Column("skills_offered", sa.Text(), nullable=True),
+        sa.Column("skills_wanted", sa.Text(), nullable=True),
+    )
+    op.create_index("ix_users_id", "users", ["id"])
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+    op.create_table(
+        "messages",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("sender_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("receiver_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("content", sa.Text(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_messages_id", "messages", ["id"])
+
+    op.create_table(
+        "sessions",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_a_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("user_b_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("skill", sa.String(length=255), nullable=False),
+        sa.Column("occurred_at", sa.DateTime(), nullable=False),
+        sa.Column("notes", sa.Text(), nullable=True),
+    )
+    op.create_index("ix_sessions_id", "sessions", ["id"])
+
+    op.create_table(
+        "ratings",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("rater_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("ratee_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("score", sa.Integer(), nullable=False),
+        sa.Column("comment", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_ratings_id", "ratings", ["id"])
+
+
+def downgrade() -> None:
+    op.drop_table("ratings")
+    op.drop_table("sessions")
+    op.drop_table("messages")
+    op.drop_table("users")
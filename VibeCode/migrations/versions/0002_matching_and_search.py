@@ -0,0 +1,128 @@
+"""Normalized skills, canonical skill columns, query indexes and catalog search
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-15
+
+Backfills user_skills and the *_norm columns from the comma-separated skill columns.
+"""
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+SEARCH_COLUMNS = ("name", "location", "skills_offered", "skills_wanted")
+
+
+def _canonical(skills_text):
+    # Frozen copy of app.main.canonical_skills as of this revision.
+    skills = {s[:64].rstrip() for t in (skills_text or "").lower().split(",") if (s := t.strip())}
+    return ",".join(sorted(skills))
+
+
+def _create_sqlite_fts() -> None:
+    columns = ", ".join(SEARCH_COLUMNS)
+    new = ", ".join(f"new.{c}" for c in SEARCH_COLUMNS)
+    old = ", ".join(f"old.{c}" for c in SEARCH_COLUMNS)
+    insert = f"INSERT INTO users_fts(rowid, {columns}) VALUES (new.id, {new});"
+    delete = f"INSERT INTO users_fts(users_fts, rowid, {columns}) VALUES ('delete', old.id, {old});"
+    op.execute(f"CREATE VIRTUAL TABLE users_fts USING fts5({columns}, content='users', content_rowid='id', tokenize='trigram')")
+    op.execute(f"CREATE TRIGGER users_fts_ai AFTER INSERT ON users BEGIN {insert} END")
+    op.execute(f"CREATE TRIGGER users_fts_ad AFTER DELETE ON users BEGIN {delete} END")
+    op.execute(f"CREATE TRIGGER users_fts_au AFTER UPDATE OF {columns} ON users BEGIN {delete} {insert} END")
+    op.execute("INSERT INTO users_fts(users_fts) VALUES ('rebuild')")
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+
+    with op.batch_alter_table("users") as batch:
+        batch.add_column(sa.Column("skills_offered_norm", sa.Text(), nullable=True))
+        batch.add_column(sa.Column("skills_wanted_norm", sa.Text(), nullable=True))
+        batch.add_column(sa.Column("updated_at", sa.DateTime(), nullable=True))
+
+    user_skills = op.create_table(
+        "user_skills",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("skill", sa.String(length=64), nullable=False),
+        sa.Column("kind", sa.Enum("offered", "wanted", name="skill_kind"), nullable=False),
+    )
+    op.create_index("ix_user_skills_id", "user_skills", ["id"])
+    op.create_index("ix_user_skills_user_id", "user_skills", ["user_id"])
+    op.create_index("ix_skill_kind", "user_skills", ["skill", "kind"])
+
+    users = sa.table(
+        "users",
+        sa.column("id", sa.Integer()),
+        sa.column("skills_offered", sa.Text()),
+        sa.column("skills_wanted", sa.Text()),
+        sa.column("skills_offered_norm", sa.Text()),
+        sa.column("skills_wanted_norm", sa.Text()),
+        sa.column("updated_at", sa.DateTime()),
+    )
+    now = datetime.utcnow()
+    skill_rows = []
+    for row in bind.execute(sa.select(users.c.id, users.c.skills_offered, users.c.skills_wanted)).all():
+        offered, wanted = _canonical(row.skills_offered), _canonical(row.skills_wanted)
+        bind.execute(
+            users.update()
+            .where(users.c.id == row.id)
+            .values(skills_offered_norm=offered, skills_wanted_norm=wanted, updated_at=now)
+        )
+        for kind, skills in (("offered", offered), ("wanted", wanted)):
+            skill_rows.extend({"user_id": row.id, "skill": s, "kind": kind} for s in skills.split(",") if s)
+    if skill_rows:
+        op.bulk_insert(user_skills, skill_rows)
+
+    with op.batch_alter_table("users") as batch:
+        batch.alter_column("skills_offered_norm", existing_type=sa.Text(), nullable=False)
+        batch.alter_column("skills_wanted_norm", existing_type=sa.Text(), nullable=False)
+        batch.alter_column("updated_at", existing_type=sa.DateTime(), nullable=False)
+    op.create_index("ix_users_updated_at", "users", ["updated_at"])
+
+    op.create_index("ix_messages_sender_created", "messages", ["sender_id", "created_at"])
+    op.create_index("ix_messages_receiver_created", "messages", ["receiver_id", "created_at"])
+    op.create_index("ix_sessions_a_occurred", "sessions", ["user_a_id", "occurred_at"])
+    op.create_index("ix_sessions_b_occurred", "sessions", ["user_b_id", "occurred_at"])
+    op.create_index("ix_ratings_ratee_created", "ratings", ["ratee_id", "created_at"])
+
+    if bind.dialect.name == "postgresql":
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        for c in SEARCH_COLUMNS:
+            op.create_index(f"ix_users_{c}_trgm", "users", [c], postgresql_using="gin", postgresql_ops={c: "gin_trgm_ops"})
+    elif bind.dialect.name == "sqlite":
+        # Created last: the batch operations above rebuild users on SQLite, which would drop the triggers.
+        _create_sqlite_fts()
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        for c in SEARCH_COLUMNS:
+            op.drop_index(f"ix_users_{c}_trgm", table_name="users")
+    elif bind.dialect.name == "sqlite":
+        for trigger in ("users_fts_ai", "users_fts_ad", "users_fts_au"):
+            op.execute(f"DROP TRIGGER {trigger}")
+        op.execute("DROP TABLE users_fts")
+
+    op.drop_index("ix_ratings_ratee_created", table_name="ratings")
+    op.drop_index("ix_sessions_b_occurred", table_name="sessions")
+    op.drop_index("ix_sessions_a_occurred", table_name="sessions")
+    op.drop_index("ix_messages_receiver_created", table_name="messages")
+    op.drop_index("ix_messages_sender_created", table_name="messages")
+
+    op.drop_index("ix_users_updated_at", table_name="users")
+    with op.batch_alter_table("users") as batch:
+        batch.drop_column("updated_at")
+        batch.drop_column("skills_wanted_norm")
+        batch.drop_column("skills_offered_norm")
+
+    op.drop_table("user_skills")
+    sa.Enum(name="skill_kind").drop(bind, checkfirst=True)
@@ -0,0 +1,22 @@
+"""Index messages by (sender, receiver, created_at) for conversation threads
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-15
+
+"""
+from alembic import op
+
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_messages_sender_receiver_created", "messages", ["sender_id", "receiver_id", "created_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_messages_sender_receiver_created", table_name="messages")
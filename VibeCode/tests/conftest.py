@@ -0,0 +1,46 @@
+import itertools
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+DB_PATH = Path(tempfile.mkdtemp()) / "test.db"
+
+# Must be set before app.database is imported: the engine is created at import time.
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{DB_PATH}"
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+os.chdir(ROOT)  # static files and templates are resolved relative to the project root
+sys.path.insert(0, str(ROOT))
+
+from alembic import command  # noqa: E402
+from alembic.config import Config  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.main import app  # noqa: E402
+
+_emails = itertools.count()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def schema():
+    command.upgrade(Config(str(ROOT / "alembic.ini")), "head")
+
+
+@pytest.fixture
+def db_path():
+    return DB_PATH
+
+
+@pytest.fixture
+def register():
+    """Return a factory that registers a new user and yields a client logged in as them."""
+    def _register(name: str, **fields) -> TestClient:
+        client = TestClient(app)
+        data = {"name": name, "email": f"user{next(_emails)}@example.com", "password": "pw", **fields}
+        response = client.post("/register", data=data, follow_redirects=False)
+        assert response.status_code == 302
+        return client
+    return _register
@@ -0,0 +1,14 @@
+def test_catalog_revalidates_with_etag(register):
+    viewer = register("Etag Viewer", skills_offered="etagging")
+
+    first = viewer.get("/skills", params={"q": "etagging"})
+    assert first.status_code == 200
+    assert first.headers["cache-control"] == "private, no-cache"
+
+    etag = first.headers["etag"]
+    assert viewer.get("/skills", params={"q": "etagging"}, headers={"If-None-Match": etag}).status_code == 304
+
+    viewer.post("/profile", data={"name": "Etag Viewer Renamed", "skills_offered": "etagging"})
+    changed = viewer.get("/skills", params={"q": "etagging"}, headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert "Etag Viewer Renamed" in changed.text
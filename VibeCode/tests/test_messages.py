@@ -0,0 +1,57 @@
+import re
+import sqlite3
+from datetime import datetime
+
+NEXT_LINK = re.compile(r'<([^>]+)>; rel="next"')
+
+
+def user_id(viewer, name):
+    [user] = viewer.get("/users/search", params={"q": name}).json()
+    return user["id"]
+
+
+def test_inbox_pages_through_messages_with_tied_timestamps(register, db_path):
+    alice = register("Paging Alice")
+    bob = register("Paging Bob")
+    bob_id = user_id(alice, "Paging Bob")
+    alice_id = user_id(bob, "Paging Alice")
+
+    # 30 messages, 11 of which share one created_at (as bulk-seeded rows or a coarse clock produce).
+    # Newest first, the tied block spans the boundary between the first and second page.
+    def created_at(i):
+        if i < 5:
+            return datetime(2026, 1, 1, 10, i)
+        if i < 16:
+            return datetime(2026, 1, 1, 11, 0)
+        return datetime(2026, 1, 1, 12, i)
+
+    rows = [(alice_id, bob_id, f"msg-{i:02d}", created_at(i)) for i in range(30)]
+    with sqlite3.connect(db_path) as conn:
+        conn.executemany(
+            "INSERT INTO messages (sender_id, receiver_id, content, created_at) VALUES (?, ?, ?, ?)",
+            # SQLAlchemy's SQLite DateTime storage format, so cursor comparisons match app-written rows.
+            [(s, r, c, ts.strftime("%Y-%m-%d %H:%M:%S.%f")) for s, r, c, ts in rows],
+        )
+
+    seen = []
+    url = "/messages"
+    while url:
+        response = bob.get(url)
+        assert response.status_code == 200
+        seen += re.findall(r"msg-\d\d", response.text)
+        link = NEXT_LINK.match(response.headers.get("link", ""))
+        url = link.group(1) if link else None
+
+    assert sorted(seen) == sorted(content for _, _, content, _ in rows)
+    assert len(seen) == len(set(seen))
+
+
+def test_inbox_rejects_malformed_cursor(register):
+    alice = register("Alice")
+    assert alice.get("/messages", params={"cursor": "not-a-cursor"}).status_code == 400
+
+
+def test_cursors_reject_ids_beyond_64_bits(register):
+    alice = register("Alice")
+    assert alice.get("/messages", params={"cursor": "2026-01-01T00:00:00,99999999999999999999"}).status_code == 400
+    assert alice.get("/skills", params={"cursor": "99999999999999999999"}).status_code == 422
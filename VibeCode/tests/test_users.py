@@ -0,0 +1,33 @@
+import sqlite3
+
+import pytest
+
+
+@pytest.mark.parametrize("method, path", [("GET", "/profile"), ("POST", "/profile"), ("GET", "/match")])
+def test_deleted_user_is_sent_to_login(register, db_path, method, path):
+    client = register("Ghost")
+    assert client.get("/profile").status_code == 200  # warms the current-user cache
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("DELETE FROM users WHERE name = 'Ghost'")
+
+    data = {"name": "Ghost"} if method == "POST" else None
+    response = client.request(method, path, data=data, follow_redirects=False)
+
+    assert response.status_code == 302
+    assert response.headers["location"] == "/login"
+    assert client.get("/", follow_redirects=False).status_code == 200
+
+
+def test_user_search_keeps_users_with_the_same_name_apart(register):
+    viewer = register("Picker")
+    register("Sam Twin")
+    register("Sam Twin")
+
+    users = viewer.get("/users/search", params={"q": "Sam Twin"}).json()
+
+    assert [u["name"] for u in users] == ["Sam Twin", "Sam Twin"]
+    first, second = (u["id"] for u in users)
+    assert first != second
+    page = viewer.get("/ratings/new", params={"for_user": second}).text
+    assert f'value="Sam Twin (#{second})"' in page
+    assert f'name="ratee_id" value="{second}"' in page